@@ -1,13 +1,53 @@
 #!/usr/bin/env python3
 import argparse
+import glob
+import io
 import json
-from bs4 import BeautifulSoup
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree
 import itertools
-import re
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Dict, Set, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ANDROID_NS = 'http://schemas.android.com/apk/res/android'
+
+def _android(attr: str) -> str:
+    return '{%s}%s' % (ANDROID_NS, attr)
+
+# Hot attribute names, interned once so lookups hash a single shared object
+_ANDROID_NAME = sys.intern(_android('name'))
+_ANDROID_EXPORTED = sys.intern(_android('exported'))
+_ANDROID_PERMISSION = sys.intern(_android('permission'))
+_ANDROID_GRANT_URI = sys.intern(_android('grantUriPermissions'))
+
+IntentData = namedtuple(
+    'IntentData',
+    ['scheme', 'host', 'port', 'path', 'pathPrefix', 'pathPattern', 'mimeType']
+)
+_DATA_ATTRS = tuple(_android(field) for field in IntentData._fields)
+
+# XPath expressions compiled once so every evaluation runs fully in libxml2
+COMPONENT_XPATH = etree.XPath(
+    '//application/*[self::activity or self::service'
+    ' or self::receiver or self::provider]'
+)
+PERMISSION_XPATH = etree.XPath('//uses-permission')
+INTENT_XPATH = etree.XPath('intent-filter')
+ACTION_XPATH = etree.XPath('action/@a:name', namespaces={'a': ANDROID_NS},
+                           smart_strings=False)
+CATEGORY_XPATH = etree.XPath('category/@a:name', namespaces={'a': ANDROID_NS},
+                             smart_strings=False)
+DATA_XPATH = etree.XPath('data')
+
 # ANSI color codes
 class Colors:
     HEADER = '\033[95m'
@@ -26,7 +66,7 @@ class Colors:
     RECEIVER = '\033[38;5;85m'   # Light Green
     PROVIDER = '\033[38;5;201m'  # Pink
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     name: str
     type: str
@@ -35,7 +75,7 @@ class Component:
     intent_filters: List[Dict]
     risks: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class AppAnalysis:
     package: str
     components: List[Component]
@@ -46,97 +86,159 @@ class AppAnalysis:
 def colorize(text: str, color: str) -> str:
     return f"{color}{text}{Colors.RESET}"
 
-def analyze_manifest(manifest_path: str, strings_path: str) -> AppAnalysis:
-    # Load string resources
-    with open(strings_path, 'r', encoding='utf-8') as f:
-        strings_xml = BeautifulSoup(f, 'xml')
-        strings = {d['name']: d.text for d in strings_xml.find_all('string', {'name': True})}
-
-    # Parse manifest
-    with open(manifest_path, 'r', encoding='utf-8') as f:
-        raw_manifest = f.read()
-        raw_manifest = re.sub(
-            r'"@string/(?P<string_name>[^"]+)"', 
-            lambda g: f'"{strings.get(g.group("string_name"), "UNKNOWN_STRING")}"', 
-            raw_manifest
-        )
-        manifest = BeautifulSoup(raw_manifest, 'xml')
-
-    package = manifest.manifest.get('package', 'UNKNOWN_PACKAGE')
+# Fixed color-wrapped fragments used once per component/permission/link;
+# precomputed so the report loops never re-wrap the same literal
+_EXPORTED_YES = colorize("Yes", Colors.YELLOW)
+_EXPORTED_NO = colorize("No", Colors.GREEN)
+_RISK_MARK = colorize('⚠', Colors.RED)
+_LINK_MARK = colorize('➤', Colors.GREEN)
+_VULN_MARK = colorize('❗', Colors.RED)
+_BULLET_RED = colorize('•', Colors.RED)
+_BULLET_YELLOW = colorize('•', Colors.YELLOW)
+_BULLET_GREEN = colorize('•', Colors.GREEN)
+
+# Permissions with protectionLevel "dangerous" in AOSP (runtime permissions)
+DANGEROUS_PERMS = frozenset('android.permission.' + p for p in (
+    'ACCEPT_HANDOVER', 'ACCESS_BACKGROUND_LOCATION', 'ACCESS_COARSE_LOCATION',
+    'ACCESS_FINE_LOCATION', 'ACCESS_MEDIA_LOCATION', 'ACTIVITY_RECOGNITION',
+    'ADD_VOICEMAIL', 'ANSWER_PHONE_CALLS', 'BLUETOOTH_ADVERTISE',
+    'BLUETOOTH_CONNECT', 'BLUETOOTH_SCAN', 'BODY_SENSORS',
+    'BODY_SENSORS_BACKGROUND', 'CALL_PHONE', 'CAMERA', 'GET_ACCOUNTS',
+    'NEARBY_WIFI_DEVICES', 'POST_NOTIFICATIONS', 'PROCESS_OUTGOING_CALLS',
+    'READ_CALENDAR', 'READ_CALL_LOG', 'READ_CONTACTS', 'READ_EXTERNAL_STORAGE',
+    'READ_MEDIA_AUDIO', 'READ_MEDIA_IMAGES', 'READ_MEDIA_VIDEO',
+    'READ_PHONE_NUMBERS', 'READ_PHONE_STATE', 'READ_SMS', 'RECEIVE_MMS',
+    'RECEIVE_SMS', 'RECEIVE_WAP_PUSH', 'RECORD_AUDIO', 'SEND_SMS', 'USE_SIP',
+    'UWB_RANGING', 'WRITE_CALENDAR', 'WRITE_CALL_LOG', 'WRITE_CONTACTS',
+    'WRITE_EXTERNAL_STORAGE',
+))
+
+# Common protectionLevel "normal" permissions
+NORMAL_PERMS = frozenset('android.permission.' + p for p in (
+    'ACCESS_NETWORK_STATE', 'ACCESS_NOTIFICATION_POLICY', 'ACCESS_WIFI_STATE',
+    'BLUETOOTH', 'BLUETOOTH_ADMIN', 'CHANGE_NETWORK_STATE',
+    'CHANGE_WIFI_MULTICAST_STATE', 'CHANGE_WIFI_STATE', 'EXPAND_STATUS_BAR',
+    'FOREGROUND_SERVICE', 'INTERNET', 'NFC', 'RECEIVE_BOOT_COMPLETED',
+    'REQUEST_DELETE_PACKAGES', 'SET_ALARM', 'SET_WALLPAPER',
+    'SET_WALLPAPER_HINTS', 'USE_BIOMETRIC', 'USE_FINGERPRINT', 'VIBRATE',
+    'WAKE_LOCK',
+))
+
+_TYPE_COLORS = {
+    'activity': Colors.ACTIVITY,
+    'service': Colors.SERVICE,
+    'receiver': Colors.RECEIVER,
+    'provider': Colors.PROVIDER
+}
+
+def _parse_component(component, deep_links: Dict[str, Set[str]]) -> Component:
+    get = component.attrib.get
+    comp_type = component.tag
+    comp_name = get(_ANDROID_NAME, '')
+    exported = get(_ANDROID_EXPORTED, 'false').lower() == 'true'
+    permission = get(_ANDROID_PERMISSION, '')
+
+    # Component risk analysis
+    risks = []
+    if exported:
+        if not permission:
+            risks.append("Exported without permission - may be accessible to other apps")
+        if comp_type == 'provider' and get(_ANDROID_GRANT_URI, 'false').lower() == 'true':
+            risks.append("Provider allows URI permission granting - potential data leakage")
+
+    intent_filters = []
+    for intent in INTENT_XPATH(component):
+        actions = ACTION_XPATH(intent)
+        categories = CATEGORY_XPATH(intent)
+        data = [
+            IntentData(*(data_tag.get(a) for a in _DATA_ATTRS))
+            for data_tag in DATA_XPATH(intent)
+        ]
+
+        # Build deep links while the data tags are already in hand rather
+        # than re-walking every component afterwards
+        for d in data:
+            if d.scheme:
+                parts = [d.scheme, '://']
+                if d.host:
+                    parts.append(d.host)
+                    if d.port:
+                        parts.append(':')
+                        parts.append(d.port)
+                    if d.path:
+                        parts.append(d.path)
+                deep_links[comp_name].add(''.join(parts))
+
+        intent_filters.append({
+            'actions': actions,
+            'categories': categories,
+            'data': data
+        })
+
+    return (
+        comp_name,
+        comp_type,
+        exported,
+        [permission] if permission else [],
+        intent_filters,
+        risks
+    )
+
+# Optional Cython-compiled copy of the parse loop; built with
+# `python setup.py build_ext --inplace`
+try:
+    from manifest_parse import parse_component as _parse_component_cy
+except ImportError:
+    _parse_component_cy = None
+
+def analyze_manifest(manifest_path: str, strings_path: Optional[str]) -> AppAnalysis:
+    # Load string resources; raw bytes go straight to libxml2 so Python
+    # never decodes either file, and names/values come back as two
+    # C-built lists zipped once
+    strings = {}
+    if strings_path is not None:
+        strings_root = etree.fromstring(Path(strings_path).read_bytes())
+        names = strings_root.xpath('string/@name')
+        texts = strings_root.xpath('string[@name]/text()')
+        if len(names) == len(texts) and not strings_root.xpath('string[@name]/*'):
+            strings = dict(zip(names, texts))
+        else:
+            # Empty or mixed-content <string> entries break the parallel
+            # text() extraction; fall back to a per-element walk
+            strings = {
+                el.get('name'): ''.join(el.itertext())
+                for el in strings_root.xpath('string[@name]')
+            }
+
+    # Parse manifest, then resolve @string references in place on the
+    # parsed tree; the raw bytes are parsed exactly once and no mutated
+    # copy of the document text is ever allocated
+    root = etree.fromstring(Path(manifest_path).read_bytes())
+    for el in root.iter():
+        for attr, val in el.attrib.items():
+            if val.startswith('@string/'):
+                el.attrib[attr] = strings.get(val[8:], 'UNKNOWN_STRING')
     analysis = AppAnalysis(
-        package=package,
+        package=root.get('package', 'UNKNOWN_PACKAGE'),
         components=[],
-        deep_links=defaultdict(list),
+        deep_links={},
         vulnerabilities=[],
         permissions=set()
     )
 
     # Extract all permissions
     analysis.permissions.update(
-        p.get('android:name', '') 
-        for p in manifest.find_all('uses-permission')
+        p.get(_ANDROID_NAME, '')
+        for p in PERMISSION_XPATH(root)
     )
 
-    # Analyze components
-    for component in manifest.find_all(['activity', 'service', 'receiver', 'provider']):
-        comp_type = component.name
-        comp_name = component.get('android:name', '')
-        exported = component.get('android:exported', 'false').lower() == 'true'
-        permission = component.get('android:permission', '')
-
-        # Component risk analysis
-        risks = []
-        if exported:
-            if not permission:
-                risks.append("Exported without permission - may be accessible to other apps")
-            if comp_type == 'provider' and 'grantUriPermissions="true"' in str(component):
-                risks.append("Provider allows URI permission granting - potential data leakage")
-
-        intent_filters = []
-        for intent in component.find_all('intent-filter'):
-            actions = [a.get('android:name') for a in intent.find_all('action')]
-            categories = [c.get('android:name') for c in intent.find_all('category')]
-            data = []
-            
-            for data_tag in intent.find_all('data'):
-                data.append({
-                    'scheme': data_tag.get('android:scheme'),
-                    'host': data_tag.get('android:host'),
-                    'port': data_tag.get('android:port'),
-                    'path': data_tag.get('android:path'),
-                    'pathPrefix': data_tag.get('android:pathPrefix'),
-                    'pathPattern': data_tag.get('android:pathPattern'),
-                    'mimeType': data_tag.get('android:mimeType')
-                })
-            
-            intent_filters.append({
-                'actions': actions,
-                'categories': categories,
-                'data': data
-            })
-
-        analysis.components.append(Component(
-            name=comp_name,
-            type=comp_type,
-            exported=exported,
-            permissions=[permission] if permission else [],
-            intent_filters=intent_filters,
-            risks=risks
-        ))
-
-    # Deep link analysis
-    for component in analysis.components:
-        for intent in component.intent_filters:
-            for data in intent['data']:
-                if data['scheme']:
-                    uri = f"{data['scheme']}://"
-                    if data['host']:
-                        uri += data['host']
-                        if data['port']:
-                            uri += f":{data['port']}"
-                        if data['path']:
-                            uri += data['path']
-                    analysis.deep_links[component.name].append(uri)
+    # Analyze components, collecting deep links into sets so duplicate
+    # URIs from overlapping data tags are only kept once
+    parse_component = _parse_component_cy or _parse_component
+    deep_links = defaultdict(set)
+    for component in COMPONENT_XPATH(root):
+        analysis.components.append(Component(*parse_component(component, deep_links)))
+    analysis.deep_links = {k: sorted(v) for k, v in deep_links.items()}
 
     # Vulnerability detection
     if any(c.exported and not c.permissions for c in analysis.components):
@@ -147,9 +249,11 @@ def analyze_manifest(manifest_path: str, strings_path: str) -> AppAnalysis:
 
     return analysis
 
-def print_report(analysis: AppAnalysis, output_format: str = 'text'):
+def render_report(analysis: AppAnalysis, output_format: str = 'text'):
+    # Returns bytes for JSON output and str for text so the caller can
+    # write either without an extra encode/decode roundtrip
     if output_format == 'json':
-        print(json.dumps({
+        payload = {
             'package': analysis.package,
             'components': [{
                 'name': c.name,
@@ -157,88 +261,143 @@ def print_report(analysis: AppAnalysis, output_format: str = 'text'):
                 'exported': c.exported,
                 'permissions': c.permissions,
                 'risks': c.risks,
-                'intent_filters': c.intent_filters
+                'intent_filters': [{
+                    'actions': f['actions'],
+                    'categories': f['categories'],
+                    'data': [d._asdict() for d in f['data']]
+                } for f in c.intent_filters]
             } for c in analysis.components],
             'deep_links': analysis.deep_links,
             'vulnerabilities': analysis.vulnerabilities,
             'permissions': list(analysis.permissions)
-        }, indent=2))
-        return
+        }
+        if orjson is not None:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b'\n'
+        return (json.dumps(payload, indent=2) + '\n').encode('utf-8')
+
+    # Colorful text output, accumulated into one buffer so the report is
+    # written with a single stdout call instead of one per line
+    buf = io.StringIO()
+    out = buf.write
+    out(colorize(f"\n📱 Android Manifest Analysis Report", Colors.BOLD + Colors.HEADER) + '\n')
+    out(colorize(f"📦 Package: {analysis.package}", Colors.BOLD + Colors.BLUE) + '\n')
 
-    # Colorful text output
-    print(colorize(f"\n📱 Android Manifest Analysis Report", Colors.BOLD + Colors.HEADER))
-    print(colorize(f"📦 Package: {analysis.package}", Colors.BOLD + Colors.BLUE))
-    
     # Components section
-    print(colorize("\n⚙️  Components", Colors.BOLD + Colors.UNDERLINE))
+    out(colorize("\n⚙️  Components", Colors.BOLD + Colors.UNDERLINE) + '\n')
     for comp in analysis.components:
         # Component type specific coloring
-        type_color = {
-            'activity': Colors.ACTIVITY,
-            'service': Colors.SERVICE,
-            'receiver': Colors.RECEIVER,
-            'provider': Colors.PROVIDER
-        }.get(comp.type, Colors.RESET)
-        
-        print(colorize(f"\n[{comp.type.upper()}]", type_color + Colors.BOLD) + 
-              f" {comp.name}")
-        
-        export_status = colorize("Yes", Colors.YELLOW) if comp.exported else colorize("No", Colors.GREEN)
-        print(f"Exported: {export_status}")
-        
+        type_color = _TYPE_COLORS.get(comp.type, Colors.RESET)
+
+        out(colorize(f"\n[{comp.type.upper()}]", type_color + Colors.BOLD) +
+            f" {comp.name}\n")
+
+        out(f"Exported: {_EXPORTED_YES if comp.exported else _EXPORTED_NO}\n")
+
         if comp.permissions:
-            print(f"Permissions: {', '.join(comp.permissions)}")
-        
+            out(f"Permissions: {', '.join(comp.permissions)}\n")
+
         if comp.risks:
-            print(colorize("Risks:", Colors.RED + Colors.BOLD))
+            out(colorize("Risks:", Colors.RED + Colors.BOLD) + '\n')
             for risk in comp.risks:
-                print(f"  {colorize('⚠', Colors.RED)} {risk}")
-        
+                out(f"  {_RISK_MARK} {risk}\n")
+
         if comp.intent_filters:
-            print(colorize("\nIntent Filters:", Colors.CYAN))
+            out(colorize("\nIntent Filters:", Colors.CYAN) + '\n')
             for i, intent in enumerate(comp.intent_filters, 1):
-                print(f"  {i}. Actions: {', '.join(intent['actions'])}")
+                out(f"  {i}. Actions: {', '.join(intent['actions'])}\n")
                 if intent['categories']:
-                    print(f"     Categories: {', '.join(intent['categories'])}")
+                    out(f"     Categories: {', '.join(intent['categories'])}\n")
                 if intent['data']:
-                    print("     Data:")
+                    out("     Data:\n")
                     for data in intent['data']:
-                        print(f"       - {data}")
+                        out(f"       - {data._asdict()}\n")
 
     # Deep Links section
-    print(colorize("\n🔗 Deep Links", Colors.BOLD + Colors.UNDERLINE))
+    out(colorize("\n🔗 Deep Links", Colors.BOLD + Colors.UNDERLINE) + '\n')
     for component, links in analysis.deep_links.items():
-        print(colorize(f"\n{component}:", Colors.BOLD))
+        out(colorize(f"\n{component}:", Colors.BOLD) + '\n')
         for link in links:
-            print(f"  {colorize('➤', Colors.GREEN)} {link}")
+            out(f"  {_LINK_MARK} {link}\n")
 
     # Security Findings section
-    print(colorize("\n🔒 Security Findings", Colors.BOLD + Colors.UNDERLINE))
+    out(colorize("\n🔒 Security Findings", Colors.BOLD + Colors.UNDERLINE) + '\n')
     if analysis.vulnerabilities:
         for vuln in analysis.vulnerabilities:
-            print(f"{colorize('❗', Colors.RED)} {colorize(vuln, Colors.RED)}")
+            out(f"{_VULN_MARK} {colorize(vuln, Colors.RED)}\n")
     else:
-        print(f"{colorize('✓', Colors.GREEN)} No critical vulnerabilities found")
+        out(f"{colorize('✓', Colors.GREEN)} No critical vulnerabilities found\n")
 
     # Permissions section
-    print(colorize("\n🛡️  Permissions", Colors.BOLD + Colors.UNDERLINE))
+    out(colorize("\n🛡️  Permissions", Colors.BOLD + Colors.UNDERLINE) + '\n')
     for perm in sorted(analysis.permissions):
-        if 'DANGEROUS' in perm or 'SIGNATURE' in perm:
-            print(f"{colorize('•', Colors.RED)} {perm}")
+        if perm in DANGEROUS_PERMS:
+            out(f"{_BULLET_RED} {perm}\n")
+        elif perm in NORMAL_PERMS:
+            out(f"{_BULLET_YELLOW} {perm}\n")
+        # Unknown permissions fall back to the old substring heuristic
+        elif 'DANGEROUS' in perm or 'SIGNATURE' in perm:
+            out(f"{_BULLET_RED} {perm}\n")
         elif 'NORMAL' in perm:
-            print(f"{colorize('•', Colors.YELLOW)} {perm}")
+            out(f"{_BULLET_YELLOW} {perm}\n")
         else:
-            print(f"{colorize('•', Colors.GREEN)} {perm}")
+            out(f"{_BULLET_GREEN} {perm}\n")
+
+    return buf.getvalue()
+
+def print_report(analysis: AppAnalysis, output_format: str = 'text'):
+    _write_report(render_report(analysis, output_format))
+
+def _write_report(report):
+    if isinstance(report, bytes):
+        sys.stdout.buffer.write(report)
+    else:
+        sys.stdout.write(report)
+
+def _find_strings(manifest_path: str, default: str) -> Optional[str]:
+    # Prefer the strings.xml that sits next to the manifest, as in an
+    # unpacked APK layout; a manifest with no reachable strings.xml is
+    # still analyzed, just without @string substitution
+    sibling = os.path.join(os.path.dirname(manifest_path), 'res', 'values', 'strings.xml')
+    if os.path.exists(sibling):
+        return sibling
+    return default if os.path.exists(default) else None
+
+def _analyze_one(job):
+    manifest_path, strings_path, output_format = job
+    try:
+        analysis = analyze_manifest(manifest_path, strings_path)
+        return render_report(analysis, output_format)
+    except Exception as e:
+        return f"{Colors.RED}Error analyzing {manifest_path}: {e}{Colors.RESET}\n"
 
 def main():
     parser = argparse.ArgumentParser(description='Advanced Android Manifest Analyzer')
-    parser.add_argument('-m', '--manifest', required=True, help='Path to AndroidManifest.xml')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('-m', '--manifest', help='Path to AndroidManifest.xml')
+    target.add_argument('-d', '--dir',
+                       help='Analyze every AndroidManifest.xml under a directory in parallel')
     parser.add_argument('-s', '--strings', default='res/values/strings.xml',
                        help='Path to strings.xml')
     parser.add_argument('-f', '--format', choices=['text', 'json'], default='text',
                        help='Output format (text/json)')
     args = parser.parse_args()
 
+    if args.dir:
+        paths = sorted(glob.glob(
+            os.path.join(args.dir, '**', 'AndroidManifest.xml'), recursive=True
+        ))
+        if not paths:
+            print(f"{Colors.RED}Error: no AndroidManifest.xml found under {args.dir}{Colors.RESET}")
+            return
+        jobs = [(p, _find_strings(p, args.strings), args.format) for p in paths]
+        # Parsing is CPU-bound and independent per manifest, so spread the
+        # files across cores; reports come back pre-serialized to keep the
+        # pickled results small
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for report in ex.map(_analyze_one, jobs, chunksize=8):
+                _write_report(report)
+        return
+
     try:
         analysis = analyze_manifest(args.manifest, args.strings)
         print_report(analysis, args.format)
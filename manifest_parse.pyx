@@ -0,0 +1,86 @@
+# cython: language_level=3
+# Cython-compiled copy of the per-component parse loop from get_schemas.
+# Keep the extraction logic here in sync with get_schemas._parse_component;
+# get_schemas falls back to the pure-Python version when this extension
+# is not built.
+from collections import namedtuple
+
+from lxml import etree
+
+ANDROID_NS = 'http://schemas.android.com/apk/res/android'
+
+cdef str _ANDROID_NAME = '{%s}name' % ANDROID_NS
+cdef str _ANDROID_EXPORTED = '{%s}exported' % ANDROID_NS
+cdef str _ANDROID_PERMISSION = '{%s}permission' % ANDROID_NS
+cdef str _ANDROID_GRANT_URI = '{%s}grantUriPermissions' % ANDROID_NS
+
+INTENT_XPATH = etree.XPath('intent-filter')
+ACTION_XPATH = etree.XPath('action/@a:name', namespaces={'a': ANDROID_NS},
+                           smart_strings=False)
+CATEGORY_XPATH = etree.XPath('category/@a:name', namespaces={'a': ANDROID_NS},
+                             smart_strings=False)
+DATA_XPATH = etree.XPath('data')
+
+IntentData = namedtuple(
+    'IntentData',
+    ['scheme', 'host', 'port', 'path', 'pathPrefix', 'pathPattern', 'mimeType']
+)
+_DATA_ATTRS = tuple('{%s}%s' % (ANDROID_NS, f) for f in IntentData._fields)
+
+
+def parse_component(component, deep_links):
+    cdef str comp_type, comp_name, permission
+    cdef bint exported
+    cdef list risks, intent_filters, actions, categories, data, parts
+
+    get = component.attrib.get
+    comp_type = component.tag
+    comp_name = get(_ANDROID_NAME, '')
+    exported = get(_ANDROID_EXPORTED, 'false').lower() == 'true'
+    permission = get(_ANDROID_PERMISSION, '')
+
+    # Component risk analysis
+    risks = []
+    if exported:
+        if not permission:
+            risks.append("Exported without permission - may be accessible to other apps")
+        if comp_type == 'provider' and get(_ANDROID_GRANT_URI, 'false').lower() == 'true':
+            risks.append("Provider allows URI permission granting - potential data leakage")
+
+    intent_filters = []
+    for intent in INTENT_XPATH(component):
+        actions = ACTION_XPATH(intent)
+        categories = CATEGORY_XPATH(intent)
+        data = [
+            IntentData(*(data_tag.get(a) for a in _DATA_ATTRS))
+            for data_tag in DATA_XPATH(intent)
+        ]
+
+        # Build deep links while the data tags are already in hand rather
+        # than re-walking every component afterwards
+        for d in data:
+            if d.scheme:
+                parts = [d.scheme, '://']
+                if d.host:
+                    parts.append(d.host)
+                    if d.port:
+                        parts.append(':')
+                        parts.append(d.port)
+                    if d.path:
+                        parts.append(d.path)
+                deep_links[comp_name].add(''.join(parts))
+
+        intent_filters.append({
+            'actions': actions,
+            'categories': categories,
+            'data': data
+        })
+
+    return (
+        comp_name,
+        comp_type,
+        exported,
+        [permission] if permission else [],
+        intent_filters,
+        risks
+    )
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# Builds the optional Cython extension with the hot parse loop:
+#   python setup.py build_ext --inplace
+# get_schemas works without it, falling back to the pure-Python loop.
+from setuptools import Extension, setup
+
+from Cython.Build import cythonize
+
+setup(
+    name='analyze-manifest',
+    py_modules=['get_schemas'],
+    ext_modules=cythonize(
+        [Extension(
+            'manifest_parse',
+            ['manifest_parse.pyx'],
+            extra_compile_args=['-O3'],
+        )],
+    ),
+)